@@ -5,6 +5,7 @@ from flask_cors import CORS
 from supabase import create_client, Client
 from groq import Groq
 from dotenv import load_dotenv
+from structured_logging import init_logging, debug_payload
 
 # Load environment variables from .env file
 load_dotenv()
@@ -13,6 +14,9 @@ load_dotenv()
 app = Flask(__name__, static_folder='static')
 CORS(app)  # [UNCHANGED] Keep global CORS configuration
 
+# JSON logs written by a background thread, tagged with the request id
+logger = init_logging(app)
+
 # [ADDED] Create API blueprint with /api prefix
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
@@ -83,7 +87,7 @@ def get_session_by_id(session_id):
             )
         return None
     except Exception as e:
-        print(f"Error fetching session by ID: {e}")
+        logger.error("Error fetching session by ID", extra={"session_id": session_id, "error": str(e)})
         return None
 
 def get_user_from_token(request):
@@ -140,7 +144,7 @@ def get_sessions():
         response = supabase.from_("sessions").select("*").eq('user_id', user.id).execute()
         return jsonify(response.data), 200
     except Exception as e:
-        print(f"Error fetching sessions: {e}")
+        logger.error("Error fetching sessions", extra={"error": str(e)})
         return jsonify({"error": "Internal server error"}), 500
         
 
@@ -189,7 +193,7 @@ def get_questions():
         return jsonify(selected_questions), 200
         
     except Exception as e:
-        print(f"Error fetching questions: {e}")
+        logger.error("Error fetching questions", extra={"error": str(e)})
         return jsonify({"error": "Internal server error"}), 500
 
 # [MOVED] API route moved to blueprint with /api prefix
@@ -246,7 +250,7 @@ def submit_answer():
         return jsonify(ai_feedback), 200
 
     except Exception as e:
-        print(f"Error processing submission: {e}")
+        logger.error("Error processing submission", extra={"error": str(e)})
         return jsonify({"error": f"An internal server error occurred: {str(e)}"}), 500
 
 # [MOVED] API route moved to blueprint with /api prefix
@@ -254,22 +258,22 @@ def submit_answer():
 @app.route("/submit-session", methods=["POST"])  # [ADDED] Backward-compatible root route
 def submit_session():
     if not groq_client or not supabase:
-        print("ERROR: Services not configured")  # Add logging
+        logger.error("Services not configured")
         return jsonify({"error": "Service not configured"}), 500
         
     user, error_response = get_user_from_token(request)
     if error_response:
-        print(f"ERROR: Authentication failed - {error_response}")  # Add logging
+        logger.warning("Authentication failed", extra={"status": error_response[1]})
         return error_response
 
     data = request.json
-    print(f"Received data: {data}")  # Add logging
+    debug_payload(logger, "Received data", data)
     session_answers = data.get("session_answers")
     topic = data.get("topic")
     difficulty = data.get("difficulty")
 
     if not session_answers:
-        print("ERROR: No session answers provided")  # Add logging
+        logger.warning("No session answers provided")
         return jsonify({"error": "Missing session_answers"}), 400
 
     try:
@@ -310,13 +314,11 @@ def submit_session():
         feedback_obj = json.loads(chat_completion.choices[0].message.content)
         final_feedback_text = feedback_obj.get("final_feedback", "Could not generate final feedback.")
 
-        print(f"DEBUG: Calculated total_score: {total_score}")
-        print(f"DEBUG: Calculated final_score: {final_score}")
-        print(f"DEBUG: Generated final_feedback_text: {final_feedback_text}")
+        logger.debug("Calculated session score", extra={"total_score": total_score, "final_score": final_score})
+        debug_payload(logger, "Generated final feedback", final_feedback_text)
 
         # --- Database Insertion Logic ---
         # 1. Create the session
-        print("---", "INSERTING SESSION", " ---")
         session_insert_response = supabase.from_("sessions").insert({
             "user_id": user.id,
             "topic": topic,
@@ -324,13 +326,13 @@ def submit_session():
             "final_score": final_score,
             "final_feedback": final_feedback_text
         }).execute()
-        print(f"Session insert response: {session_insert_response.data}")
+        debug_payload(logger, "Session insert response", session_insert_response.data)
 
         if not session_insert_response.data:
             raise Exception("Failed to create session in database.")
 
         new_session_id = session_insert_response.data[0]['id']
-        print(f"New session ID: {new_session_id}")
+        logger.info("Session created", extra={"session_id": new_session_id, "answer_count": len(session_answers)})
   
         # 2. Prepare and insert all answers
         answers_to_insert = []
@@ -344,20 +346,17 @@ def submit_session():
                 "corrections": item.get("feedback", {}).get("corrections")
             })
         
-        print("---", "INSERTING ANSWERS", " ---")
         answers_insert_response = supabase.from_("answers").insert(answers_to_insert).execute()
-        print(f"Answers insert response: {answers_insert_response.data}")
+        debug_payload(logger, "Answers insert response", answers_insert_response.data)
 
         # 3. Verify the insert
-        print("---", "VERIFYING INSERT", " ---")
         verify_response = supabase.from_("sessions").select("*, answers(*)").eq("id", new_session_id).execute()
-        print(f"Verification SELECT response: {verify_response.data}")
-        print("---", "END VERIFYING INSERT", " ---")
+        debug_payload(logger, "Verification SELECT response", verify_response.data)
         
         return jsonify(verify_response.data[0]), 200
 
-    except Exception as e:
-        print(f"Error submitting session: {e}")
+    except Exception:
+        logger.exception("Error submitting session")
         return jsonify({"error": "An error occurred while finalizing the session"}), 500
 
 
@@ -387,7 +386,7 @@ def delete_session(session_id):
         return jsonify({"message": "Session deleted successfully"}), 200
 
     except Exception as e:
-        print(f"Error deleting session {session_id}: {e}")
+        logger.error("Error deleting session", extra={"session_id": session_id, "error": str(e)})
         return jsonify({"error": "An error occurred while deleting the session"}), 500
 
 # [MOVED] API route moved to blueprint with /api prefix
@@ -416,7 +415,7 @@ def delete_all_sessions():
         return jsonify({"message": "All sessions deleted successfully"}), 200
 
     except Exception as e:
-        print(f"Error deleting all sessions: {e}")
+        logger.error("Error deleting all sessions", extra={"error": str(e)})
         return jsonify({"error": "An error occurred while deleting sessions"}), 500
 
 # [MOVED] API route moved to blueprint with /api prefix
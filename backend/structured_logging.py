@@ -0,0 +1,199 @@
+import os
+import copy
+import sys
+import json
+import time
+import uuid
+import queue
+import random
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_request_context, request
+
+
+def _env_number(name, default, cast):
+    """Read a numeric setting, falling back to the default on a bad value"""
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_level(name, default):
+    """Read a log level name, falling back to the default if it is unknown"""
+    level = os.environ.get(name, default).upper()
+    return level if isinstance(logging.getLevelName(level), int) else default
+
+
+# Logging settings (all optional, read from the environment)
+LOG_LEVEL = _env_level("LOG_LEVEL", "INFO")
+LOG_QUEUE_SIZE = _env_number("LOG_QUEUE_SIZE", 10000, int)
+LOG_MAX_PAYLOAD_CHARS = _env_number("LOG_MAX_PAYLOAD_CHARS", 2000, int)
+LOG_DEBUG_SAMPLE_RATE = _env_number("LOG_DEBUG_SAMPLE_RATE", 1.0, float)
+# Per-route overrides, keyed by view name (with or without the "api." blueprint
+# prefix): "submit_session=0.1,submit_answer=0.5"
+LOG_DEBUG_SAMPLE_RATES = os.environ.get("LOG_DEBUG_SAMPLE_RATES", "")
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener = None
+
+
+def parse_sample_rates(spec):
+    """Parse "endpoint=rate,endpoint=rate" into a dict, ignoring bad entries"""
+    rates = {}
+    for entry in spec.split(","):
+        name, sep, value = entry.partition("=")
+        if not sep:
+            continue
+        try:
+            rates[name.strip()] = min(max(float(value), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+_sample_rates = parse_sample_rates(LOG_DEBUG_SAMPLE_RATES)
+
+
+def sample_rate_for(endpoint):
+    """Debug payload sample rate for an endpoint, with or without its blueprint prefix"""
+    if endpoint is None:
+        return LOG_DEBUG_SAMPLE_RATE
+    if endpoint in _sample_rates:
+        return _sample_rates[endpoint]
+    return _sample_rates.get(endpoint.rsplit(".", 1)[-1], LOG_DEBUG_SAMPLE_RATE)
+
+
+def truncate(value, limit=None):
+    """Serialize a payload for logging, capped at `limit` characters"""
+    limit = LOG_MAX_PAYLOAD_CHARS if limit is None else limit
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}...[truncated {len(text) - limit} chars]"
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach request id, method and route to every record logged inside a request"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get("request_id")
+            record.method = request.method
+            record.route = request.endpoint
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Render each record as a single JSON line"""
+
+    converter = time.gmtime
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        exc_text = self.formatException(record.exc_info) if record.exc_info else record.exc_text
+        if exc_text:
+            entry["exc_info"] = exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Never block the request thread: drop records when the queue is full.
+
+    The number of dropped records is reported as `dropped_records` on the
+    next record that makes it into the queue.
+    """
+
+    dropped = 0
+
+    def prepare(self, record):
+        # Resolve the message and traceback here so the record can cross threads,
+        # but keep them apart so the traceback ends up in its own JSON field
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        # Called from handle() with the handler lock held, so the counter is safe
+        if self.dropped:
+            record.dropped_records = self.dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.dropped = 0
+
+
+def get_logger(name="interview_app"):
+    return logging.getLogger(name)
+
+
+def debug_payload(logger, message, payload, **fields):
+    """Log a (size-capped) payload at DEBUG, only for requests picked by sampling"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    if has_request_context() and not g.get("log_payloads", False):
+        return
+    logger.debug(message, extra={**fields, "payload": truncate(payload)})
+
+
+def _before_request():
+    g.request_id = request.headers.get(REQUEST_ID_HEADER, "")[:128] or uuid.uuid4().hex
+    g.request_start = time.perf_counter()
+    g.log_payloads = random.random() < sample_rate_for(request.endpoint)
+
+
+def _after_request(response):
+    response.headers[REQUEST_ID_HEADER] = g.get("request_id", "")
+    start = g.get("request_start")
+    if start is not None:
+        get_logger().info("request completed", extra={
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        })
+    return response
+
+
+def init_logging(app, logger=None):
+    """Route app logs through a background JSON handler and hook request ids into Flask"""
+    global _listener
+    logger = logger or get_logger()
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+    if _listener is None:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter())
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        queue_handler = DroppingQueueHandler(log_queue)
+        queue_handler.addFilter(RequestContextFilter())
+        logger.handlers = [queue_handler]
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    return logger
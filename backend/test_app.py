@@ -229,3 +229,166 @@ def test_get_questions_success(client, mock_supabase):
         data = json.loads(response.data)
         assert len(data) == 1
         assert data[0]['topic'] == 'CI/CD'  # This assertion was failing
+
+
+# -------------------------
+# Structured logging
+# -------------------------
+
+def test_request_id_is_generated_and_echoed(client):
+    """Every response carries a request id, reusing the caller's when given"""
+    with patch("app.send_from_directory", return_value="HTML"):
+        resp = client.get("/")
+        assert resp.headers.get("X-Request-ID")
+
+        resp = client.get("/", headers={"X-Request-ID": "abc-123"})
+        assert resp.headers["X-Request-ID"] == "abc-123"
+
+
+def test_truncate_caps_payload_size():
+    from structured_logging import truncate
+    assert truncate({"a": 1}, limit=100) == '{"a": 1}'
+    capped = truncate("x" * 50, limit=10)
+    assert capped.startswith("x" * 10)
+    assert "truncated 40 chars" in capped
+
+
+def test_parse_sample_rates():
+    from structured_logging import parse_sample_rates
+    rates = parse_sample_rates("submit_session=0.1, submit_answer=2,bad,get_sessions=x")
+    assert rates == {"submit_session": 0.1, "submit_answer": 1.0}
+
+
+def test_json_formatter_includes_extra_fields():
+    import logging
+    from structured_logging import JsonFormatter
+    record = logging.makeLogRecord({
+        "name": "interview_app", "levelname": "INFO", "msg": "Session created",
+        "request_id": "abc-123", "session_id": 7,
+    })
+    line = json.loads(JsonFormatter().format(record))
+    assert line["message"] == "Session created"
+    assert line["request_id"] == "abc-123"
+    assert line["session_id"] == 7
+
+
+@pytest.fixture
+def log_records():
+    """Capture records as they reach the queue, after the request-context filter ran"""
+    from structured_logging import get_logger
+    logger = get_logger()
+    level = logger.level
+    records = []
+    with patch.object(logger.handlers[0], "enqueue", side_effect=records.append):
+        yield records
+    logger.setLevel(level)
+
+
+def test_log_lines_carry_request_context(client, log_records):
+    """Records logged inside a request include request_id, method and route"""
+    with patch("app.supabase", None):
+        client.get("/api/sessions", headers={"X-Request-ID": "req-42"})
+
+    record = next(r for r in log_records if r.getMessage() == "request completed")
+    assert record.request_id == "req-42"
+    assert record.method == "GET"
+    assert record.route == "api.get_sessions"
+    assert record.status == 500
+
+
+@pytest.mark.parametrize("path", ["/api/submit-session", "/submit-session"])
+def test_sample_rate_override_applies_to_both_routes(client, path):
+    """Per-route overrides match the view name with or without the blueprint prefix"""
+    from flask import g
+    with patch("structured_logging._sample_rates", {"submit_session": 0.0}), \
+            patch("structured_logging.LOG_DEBUG_SAMPLE_RATE", 1.0):
+        client.post(path, json={})
+        assert g.log_payloads is False
+
+    with patch("structured_logging._sample_rates", {"submit_session": 1.0}), \
+            patch("structured_logging.LOG_DEBUG_SAMPLE_RATE", 0.0):
+        client.post(path, json={})
+        assert g.log_payloads is True
+
+
+def test_sample_rate_for_unmatched_endpoint():
+    from structured_logging import sample_rate_for
+    with patch("structured_logging.LOG_DEBUG_SAMPLE_RATE", 0.25):
+        assert sample_rate_for(None) == 0.25
+        assert sample_rate_for("api.get_sessions") == 0.25
+
+
+def test_debug_payload_skipped_at_info_or_when_not_sampled(log_records):
+    from flask import g
+    from structured_logging import get_logger, debug_payload
+    logger = get_logger()
+    with app.test_request_context("/api/submit-session", method="POST"):
+        logger.setLevel("INFO")
+        g.log_payloads = True
+        debug_payload(logger, "Received data", {"a": 1})
+
+        logger.setLevel("DEBUG")
+        g.log_payloads = False
+        debug_payload(logger, "Received data", {"a": 1})
+
+    assert log_records == []
+
+
+def test_debug_payload_logs_capped_payload_when_sampled(log_records):
+    from flask import g
+    from structured_logging import get_logger, debug_payload
+    logger = get_logger()
+    logger.setLevel("DEBUG")
+    with app.test_request_context("/api/submit-session", method="POST"), \
+            patch("structured_logging.LOG_MAX_PAYLOAD_CHARS", 10):
+        g.log_payloads = True
+        debug_payload(logger, "Received data", "x" * 50)
+
+    assert len(log_records) == 1
+    assert log_records[0].payload.startswith("x" * 10)
+    assert "truncated 40 chars" in log_records[0].payload
+
+
+def test_queue_handler_drops_and_reports_when_full():
+    """A full queue drops records without blocking and reports the count on the next one"""
+    import queue
+    import logging
+    from structured_logging import DroppingQueueHandler
+    log_queue = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(log_queue)
+
+    def record(msg):
+        return logging.makeLogRecord({"msg": msg, "levelname": "INFO", "levelno": logging.INFO})
+
+    handler.handle(record("first"))
+    handler.handle(record("second"))
+    handler.handle(record("third"))
+    assert log_queue.qsize() == 1
+    assert handler.dropped == 2
+
+    assert log_queue.get_nowait().getMessage() == "first"
+    handler.handle(record("fourth"))
+    reported = log_queue.get_nowait()
+    assert reported.getMessage() == "fourth"
+    assert reported.dropped_records == 2
+    assert handler.dropped == 0
+
+
+def test_json_formatter_includes_stack_info():
+    import logging
+    from structured_logging import JsonFormatter
+    record = logging.makeLogRecord({"msg": "m", "stack_info": "Stack (most recent call last):\n  here"})
+    line = json.loads(JsonFormatter().format(record))
+    assert line["stack_info"].endswith("here")
+
+
+def test_bad_env_values_fall_back_to_defaults(monkeypatch):
+    from structured_logging import _env_number, _env_level
+    monkeypatch.setenv("LOG_QUEUE_SIZE", "lots")
+    monkeypatch.setenv("LOG_DEBUG_SAMPLE_RATE", "often")
+    monkeypatch.setenv("LOG_LEVEL", "LOUD")
+    assert _env_number("LOG_QUEUE_SIZE", 10000, int) == 10000
+    assert _env_number("LOG_DEBUG_SAMPLE_RATE", 1.0, float) == 1.0
+    assert _env_level("LOG_LEVEL", "INFO") == "INFO"
+    monkeypatch.setenv("LOG_LEVEL", "debug")
+    assert _env_level("LOG_LEVEL", "INFO") == "DEBUG"